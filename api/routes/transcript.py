@@ -1,280 +1,409 @@
-import os
+import io
+import queue
 import base64
-import tempfile
-from fastapi import APIRouter, HTTPException
-from typing import List, Optional
-from schemas.transcript import TranscriptRequest, TranscriptResponse, TranscriptSegment
+import asyncio
+import threading
+import httpx
+import orjson
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from schemas.transcript import TranscriptRequest, TranscriptResponse
 import logging
 import yt_dlp
+from yt_dlp.cookies import YoutubeDLCookieJar
 from config import settings
+from services.cache import TTLCache
+from services.vtt_parser import (
+    VttStreamParser,
+    iter_json3_segments,
+    iter_vtt_segments,
+    validate_segments,
+)
 
 router = APIRouter()
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Global cookie file path (created once at startup if cookies are configured)
-_cookie_file_path: Optional[str] = None
+# Parsed YouTube cookies (set once by the startup hook if cookies are configured),
+# shared by every pooled YoutubeDL instance
+_COOKIE_JAR: Optional[YoutubeDLCookieJar] = None
 
+# Long-lived YoutubeDL instances. An instance is not safe for concurrent
+# extract_info calls, so each request checks one out and returns it after.
+YDL_POOL_SIZE = 8
+_YDL_POOL: "queue.Queue[yt_dlp.YoutubeDL]" = queue.Queue()
+_ydl_pool_lock = threading.Lock()
+_ydl_pool_ready = False
 
-def get_cookie_file_path() -> Optional[str]:
+# Parsed transcripts keyed by videoId (URL variants share the same id)
+TRANSCRIPT_CACHE_TTL_SECONDS = 3600
+_transcript_cache = TTLCache(maxsize=1024, ttl=TRANSCRIPT_CACHE_TTL_SECONDS)
+
+# Subtitle track formats we can parse, most preferred first
+SUBTITLE_EXT_PREFERENCE = ('json3', 'vtt')
+
+
+def load_cookie_jar() -> Optional[YoutubeDLCookieJar]:
     """
-    Decode base64 YouTube cookies from environment and write to temp file.
-    Returns the path to the cookie file, or None if not configured.
+    Decode base64 YouTube cookies from environment and parse them into an
+    in-memory cookie jar. Returns the jar, or None if not configured.
+    Called once from the app's startup event, before the YoutubeDL pool is built.
     """
-    global _cookie_file_path
-    
-    # Return cached path if already created
-    if _cookie_file_path and os.path.exists(_cookie_file_path):
-        return _cookie_file_path
-    
+    global _COOKIE_JAR
+
+    # Return cached jar if already loaded
+    if _COOKIE_JAR is not None:
+        return _COOKIE_JAR
+
     cookies_b64 = settings.YOUTUBE_COOKIES_BASE64
     if not cookies_b64 or cookies_b64 == "":
         logger.info("No YouTube cookies configured - running without authentication")
         return None
-    
+
     try:
-        # Decode base64 cookies
+        # Decode base64 cookies and parse the Netscape cookie file once
         cookies_content = base64.b64decode(cookies_b64).decode('utf-8')
-        
-        # Write to temp file
-        fd, path = tempfile.mkstemp(suffix='.txt', prefix='yt_cookies_')
-        with os.fdopen(fd, 'w') as f:
-            f.write(cookies_content)
-        
-        _cookie_file_path = path
-        logger.info(f"YouTube cookies loaded successfully")
-        return path
+        jar = YoutubeDLCookieJar()
+        jar.load(io.StringIO(cookies_content))
+
+        _COOKIE_JAR = jar
+        logger.info("YouTube cookies loaded successfully")
+        return jar
     except Exception as e:
         logger.error(f"Failed to decode YouTube cookies: {e}")
         return None
 
 
-@router.post("/transcript")
-async def get_transcript(request: TranscriptRequest) -> TranscriptResponse:
-    """
-    Fetch YouTube video captions using yt-dlp.
-    Uses cookies for authentication if configured to bypass bot detection.
+def _build_ydl_opts() -> dict:
+    """yt-dlp options shared by every pooled extractor."""
+    ydl_opts = {
+        'quiet': True,
+        'no_warnings': True,
+        'writesubtitles': True,
+        'subtitle': ['en'],
+        'subtitlesformat': 'json3/vtt/best',
+    }
 
-    Args:
-        request: Contains videoUrl and videoId
+    return ydl_opts
 
-    Returns:
-        TranscriptResponse with video ID, title, and segments with timestamps
+
+def init_ydl_pool(size: int = YDL_POOL_SIZE) -> None:
     """
-    try:
-        logger.info(f"Fetching transcript for video: {request.videoId}")
-
-        # Fetch video info and subtitles using yt-dlp
-        ydl_opts = {
-            'quiet': True,
-            'no_warnings': True,
-            'writesubtitles': True,
-            'subtitle': ['en'],
-        }
-        
-        # Add cookies if available (helps bypass bot detection)
-        cookie_file = get_cookie_file_path()
-        if cookie_file:
-            ydl_opts['cookiefile'] = cookie_file
+    Build the pool of long-lived YoutubeDL instances. Call after the cookie
+    jar is loaded (see load_cookie_jar) so every instance picks it up.
+    Safe to call more than once.
+    """
+    global _ydl_pool_ready
+
+    with _ydl_pool_lock:
+        if _ydl_pool_ready:
+            return
+        ydl_opts = _build_ydl_opts()
+        if _COOKIE_JAR is not None:
             logger.info("Using YouTube cookies for authentication")
 
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            try:
-                info = ydl.extract_info(request.videoUrl, download=False)
-            except Exception as e:
-                logger.error(f"Error fetching video: {str(e)}")
-                raise HTTPException(status_code=404, detail="Video not found")
-
-            video_title = info.get('title', 'Unknown')
-            logger.info(f"Video title: {video_title}")
-
-            # Try to get subtitles
-            subtitles = None
-            subtitle_format = None
-
-            # First try regular subtitles
-            if info.get('subtitles') and 'en' in info.get('subtitles', {}):
-                subtitles = info['subtitles']['en']
-                subtitle_format = 'regular'
-                logger.info("Found regular subtitles")
-            # Then try auto-generated captions
-            elif info.get('automatic_captions') and 'en' in info.get('automatic_captions', {}):
-                subtitles = info['automatic_captions']['en']
-                subtitle_format = 'auto'
-                logger.info("Found auto-generated captions")
-
-            if not subtitles:
-                logger.warning(f"No English subtitles found for video: {request.videoId}")
-                raise HTTPException(
-                    status_code=404,
-                    detail="This video does not have English subtitles available"
-                )
-
-            # Find VTT format subtitle
-            vtt_subtitle = None
-            for sub in subtitles:
-                if sub.get('ext') == 'vtt':
-                    vtt_subtitle = sub
-                    break
-
-            # If no VTT, use first available
-            if not vtt_subtitle:
-                vtt_subtitle = subtitles[0]
-
-            # Get the actual subtitle content
-            subtitle_url = vtt_subtitle.get('url')
-            logger.info(f"Downloading subtitle from: {subtitle_url}")
-
-            # Download subtitle content
-            import urllib.request
+        for _ in range(size):
+            ydl = yt_dlp.YoutubeDL(ydl_opts)
+            # Add cookies if available (helps bypass bot detection); replaces
+            # yt-dlp's lazily loaded jar so no cookie file is parsed per instance
+            if _COOKIE_JAR is not None:
+                ydl.cookiejar = _COOKIE_JAR
+            _YDL_POOL.put(ydl)
+        _ydl_pool_ready = True
+
+
+def close_ydl_pool() -> None:
+    """Close every idle pooled YoutubeDL instance."""
+    global _ydl_pool_ready
+
+    with _ydl_pool_lock:
+        while True:
             try:
-                with urllib.request.urlopen(subtitle_url) as response:
-                    vtt_content = response.read().decode('utf-8')
-            except Exception as e:
-                logger.error(f"Error downloading subtitle: {str(e)}")
-                raise HTTPException(status_code=500, detail="Failed to download subtitles")
+                _YDL_POOL.get_nowait().close()
+            except queue.Empty:
+                break
+        _ydl_pool_ready = False
 
-            # Parse VTT to segments
-            segments = parse_vtt_captions(vtt_content)
 
-            if not segments:
-                raise HTTPException(status_code=400, detail="Failed to parse subtitles")
+def _extract_info(video_url: str) -> dict:
+    """
+    Run yt-dlp metadata extraction on a pooled YoutubeDL instance. This does
+    blocking network I/O (and may wait for a free instance), so callers on the
+    event loop should run it in a worker thread.
+    """
+    init_ydl_pool()
+    ydl = _YDL_POOL.get()
+    try:
+        return ydl.extract_info(video_url, download=False)
+    finally:
+        _YDL_POOL.put(ydl)
 
-            logger.info(f"Successfully fetched {len(segments)} subtitle segments")
 
-            return TranscriptResponse(
-                videoId=request.videoId,
-                title=video_title,
-                segments=segments
-            )
+async def _resolve_subtitle(video_id: str, video_url: str) -> Tuple[str, dict, str]:
+    """
+    Run yt-dlp extraction and pick the English subtitle track to download.
+    Returns (video title, subtitle track info, "regular" | "auto").
+    Raises HTTPException for the expected failure cases, including a
+    video_url that resolves to a different video than video_id.
+    """
+    logger.debug("Fetching transcript for video: %s", video_id)
 
-    except HTTPException:
-        raise
+    # Fetch video info and subtitles using yt-dlp
+    try:
+        info = await asyncio.to_thread(_extract_info, video_url)
     except Exception as e:
-        logger.error(f"Error fetching transcript: {str(e)}", exc_info=True)
+        logger.error(f"Error fetching video: {str(e)}")
+        raise HTTPException(status_code=404, detail="Video not found")
+
+    # Transcripts are cached under videoId, so it must name the video that
+    # videoUrl actually resolved to
+    if info.get('id') != video_id:
+        logger.warning("videoId %s does not match videoUrl (resolved to %s)", video_id, info.get('id'))
+        raise HTTPException(status_code=400, detail="videoId does not match videoUrl")
+
+    video_title = info.get('title', 'Unknown')
+    logger.debug("Video title: %s", video_title)
+
+    # Try to get subtitles
+    subtitles = None
+    subtitle_format = None
+
+    # First try regular subtitles
+    if info.get('subtitles') and 'en' in info.get('subtitles', {}):
+        subtitles = info['subtitles']['en']
+        subtitle_format = 'regular'
+        logger.debug("Found regular subtitles")
+    # Then try auto-generated captions
+    elif info.get('automatic_captions') and 'en' in info.get('automatic_captions', {}):
+        subtitles = info['automatic_captions']['en']
+        subtitle_format = 'auto'
+        logger.debug("Found auto-generated captions")
+
+    if not subtitles:
+        logger.warning("No English subtitles found for video: %s", video_id)
         raise HTTPException(
-            status_code=500,
-            detail=f"Error fetching transcript: {str(e)}"
+            status_code=404,
+            detail="This video does not have English subtitles available"
         )
 
-def parse_vtt_captions(vtt_content: str) -> List[TranscriptSegment]:
+    # Prefer YouTube's JSON (json3) track, which needs no text parsing, then VTT
+    subtitle = None
+    for want in SUBTITLE_EXT_PREFERENCE:
+        subtitle = next((sub for sub in subtitles if sub.get('ext') == want), None)
+        if subtitle:
+            break
+
+    # If neither is offered, use first available
+    if not subtitle:
+        subtitle = subtitles[0]
+
+    return video_title, subtitle, subtitle_format
+
+
+async def _aiter_subtitle_segments(
+    http_client: httpx.AsyncClient,
+    subtitle: dict,
+    subtitle_format: str
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Download a subtitle track and yield segment dicts as they are parsed.
+    Download/HTTP errors propagate to the caller.
+    If yt-dlp already embedded the track text, it is parsed without a download.
     """
-    Parse WebVTT caption format into transcript segments.
-    Groups captions into ~5 second chunks for better UX.
+    dedup = subtitle_format == 'auto'
+
+    inline = subtitle.get('data') if settings.YOUTUBE_INLINE_SUBTITLES else None
+    if isinstance(inline, (str, bytes)) and inline:
+        logger.debug("Using inline %s subtitle data", subtitle.get('ext'))
+        if subtitle.get('ext') == 'json3':
+            for segment in iter_json3_segments(inline):
+                yield segment
+        else:
+            if isinstance(inline, bytes):
+                inline = inline.decode('utf-8')
+            for segment in iter_vtt_segments(inline, dedup):
+                yield segment
+        return
+
+    # Get the actual subtitle content
+    subtitle_url = subtitle.get('url')
+    logger.debug("Downloading %s subtitle from: %s", subtitle.get('ext'), subtitle_url)
+
+    if subtitle.get('ext') == 'json3':
+        response = await http_client.get(subtitle_url)
+        response.raise_for_status()
+        for segment in iter_json3_segments(response.content):
+            yield segment
+    else:
+        # Download subtitle content and parse VTT to segments as it arrives
+        async with http_client.stream("GET", subtitle_url) as response:
+            response.raise_for_status()
+            async for segment in aiter_vtt_segments(response.aiter_text(), dedup):
+                yield segment
+
+
+async def _fetch_and_parse(
+    video_id: str,
+    video_url: str,
+    http_client: httpx.AsyncClient
+) -> TranscriptResponse:
+    """
+    Run the full yt-dlp extraction + subtitle download + parse pipeline.
+    Raises HTTPException for the expected failure cases.
+    """
+    video_title, subtitle, subtitle_format = await _resolve_subtitle(video_id, video_url)
+
+    try:
+        segments = [
+            segment async for segment in
+            _aiter_subtitle_segments(http_client, subtitle, subtitle_format)
+        ]
+    except Exception as e:
+        logger.error(f"Error downloading subtitle: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to download subtitles")
 
-    VTT format:
-    WEBVTT
+    if not segments:
+        raise HTTPException(status_code=400, detail="Failed to parse subtitles")
 
-    00:00:00.000 --> 00:00:05.000
-    This is the first caption
+    logger.info(
+        "Fetched %d transcript segments for video %s (%s %s subtitles)",
+        len(segments), video_id, subtitle_format, subtitle.get('ext')
+    )
 
-    00:00:05.000 --> 00:00:10.000
-    This is the second caption
+    return TranscriptResponse(
+        videoId=video_id,
+        title=video_title,
+        segments=validate_segments(segments)
+    )
+
+
+@router.post("/transcript")
+async def get_transcript(
+    request: TranscriptRequest,
+    http_request: Request,
+    response: Response
+) -> TranscriptResponse:
     """
-    # First, parse individual captions
-    raw_captions = []
-    lines = vtt_content.strip().split("\n")
+    Fetch YouTube video captions using yt-dlp.
+    Uses cookies for authentication if configured to bypass bot detection.
+    Results are cached per videoId for TRANSCRIPT_CACHE_TTL_SECONDS.
 
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
+    Args:
+        request: Contains videoUrl and videoId
+        http_request: Incoming request, used to reach the shared HTTP client
+        response: Outgoing response, used to set caching headers
 
-        # Skip WEBVTT header and empty lines
-        if not line or line.startswith("WEBVTT") or line.startswith("NOTE") or "-->" not in line:
-            i += 1
-            continue
+    Returns:
+        TranscriptResponse with video ID, title, and segments with timestamps
+    """
+    try:
+        transcript = _transcript_cache.get(request.videoId)
+        if transcript is None:
+            transcript = await _fetch_and_parse(
+                request.videoId,
+                request.videoUrl,
+                http_request.app.state.http
+            )
+            _transcript_cache.set(request.videoId, transcript)
 
-        # Parse timestamp line
-        if "-->" in line:
-            try:
-                time_parts = line.split("-->")
-                start_time = parse_vtt_timestamp(time_parts[0].strip())
-                end_time = parse_vtt_timestamp(time_parts[1].strip().split()[0])
-
-                # Get caption text (next line(s) until empty line)
-                caption_text = []
-                i += 1
-                while i < len(lines) and lines[i].strip():
-                    text = lines[i].strip()
-                    # Skip styling tags
-                    if not text.startswith("<") and not text.endswith(">"):
-                        caption_text.append(text)
-                    i += 1
-
-                if caption_text:
-                    raw_captions.append({
-                        "text": " ".join(caption_text),
-                        "startTime": start_time,
-                        "endTime": end_time
-                    })
-            except Exception as e:
-                logger.warning(f"Error parsing caption line: {line}, error: {e}")
-
-        i += 1
-
-    # Now group captions into ~5 second segments
-    segments = []
-    segment_id = 0
-    claim_id = 0
-
-    if not raw_captions:
-        return segments
-
-    # Group captions - aim for roughly 5-second chunks
-    i = 0
-    while i < len(raw_captions):
-        current_segment_start = raw_captions[i]["startTime"]
-        current_segment_text = []
-        current_segment_end = raw_captions[i]["endTime"]
-
-        # Accumulate captions until we reach ~5 seconds
-        while i < len(raw_captions):
-            caption = raw_captions[i]
-            current_segment_text.append(caption["text"])
-            current_segment_end = caption["endTime"]
-
-            # Check if we've accumulated enough (roughly 5 seconds worth)
-            duration = current_segment_end - current_segment_start
-            i += 1
-
-            # Break if we've reached 5 seconds or more, or if this is the last caption
-            if duration >= 5 or i >= len(raw_captions):
-                break
+        response.headers["Cache-Control"] = f"public, max-age={TRANSCRIPT_CACHE_TTL_SECONDS}"
+        return transcript
 
-        # Create segment from accumulated captions
-        if current_segment_text:
-            segment_text = " ".join(current_segment_text)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching transcript: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error fetching transcript: {str(e)}"
+        )
 
-            # Extract first 2 words as claim for highlighting/clicking
-            words = segment_text.split()[:2]
-            claim_text = " ".join(words) if words else segment_text
 
-            segments.append(TranscriptSegment(
-                id=f"seg_{segment_id}",
-                text=segment_text,
-                startTime=current_segment_start,
-                endTime=current_segment_end,
-                claim=claim_text,
-                claimIndex=claim_id
-            ))
+def _ndjson_line(obj: Any) -> bytes:
+    return orjson.dumps(obj) + b"\n"
 
-            claim_id += 1
-            segment_id += 1
 
-    return segments
-def parse_vtt_timestamp(timestamp_str: str) -> float:
+@router.post("/transcript/stream")
+async def stream_transcript(
+    request: TranscriptRequest,
+    http_request: Request
+) -> StreamingResponse:
     """
-    Convert VTT timestamp to seconds.
-    Format: HH:MM:SS.mmm or MM:SS.mmm
+    NDJSON variant of /transcript: the first line is {"videoId", "title"},
+    followed by one TranscriptSegment object per line as each ~5 second
+    group is parsed, so clients can render before the whole track is done.
+    Errors after streaming has begun are reported as a final {"error"} line.
+    Completed transcripts are stored in the same cache as /transcript.
+    Only replays from that cache are marked cacheable; a live stream may
+    still end in an error line.
     """
-    parts = timestamp_str.split(":")
-
-    if len(parts) == 3:
-        hours, minutes, seconds = parts
-        return float(hours) * 3600 + float(minutes) * 60 + float(seconds)
-    elif len(parts) == 2:
-        minutes, seconds = parts
-        return float(minutes) * 60 + float(seconds)
-    else:
-        return float(timestamp_str)
+    cached = _transcript_cache.get(request.videoId)
+    if cached is not None:
+        async def replay() -> AsyncIterator[bytes]:
+            yield _ndjson_line({"videoId": cached.videoId, "title": cached.title})
+            for segment in cached.segments:
+                yield _ndjson_line(segment.model_dump())
+
+        return StreamingResponse(
+            replay(),
+            media_type="application/x-ndjson",
+            headers={"Cache-Control": f"public, max-age={TRANSCRIPT_CACHE_TTL_SECONDS}"},
+        )
+
+    try:
+        video_title, subtitle, subtitle_format = await _resolve_subtitle(
+            request.videoId,
+            request.videoUrl
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching transcript: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error fetching transcript: {str(e)}"
+        )
 
+    http_client = http_request.app.state.http
+
+    async def generate() -> AsyncIterator[bytes]:
+        yield _ndjson_line({"videoId": request.videoId, "title": video_title})
+
+        segments = []
+        try:
+            async for segment in _aiter_subtitle_segments(http_client, subtitle, subtitle_format):
+                segments.append(segment)
+                yield _ndjson_line(segment)
+        except Exception as e:
+            logger.error(f"Error downloading subtitle: {str(e)}")
+            yield _ndjson_line({"error": "Failed to download subtitles"})
+            return
+
+        if not segments:
+            yield _ndjson_line({"error": "Failed to parse subtitles"})
+            return
+
+        _transcript_cache.set(request.videoId, TranscriptResponse(
+            videoId=request.videoId,
+            title=video_title,
+            segments=validate_segments(segments)
+        ))
+
+    return StreamingResponse(
+        generate(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-store"},
+    )
+
+
+async def aiter_vtt_segments(
+    chunks: AsyncIterator[str],
+    dedup: bool = False
+) -> AsyncIterator[Dict[str, Any]]:
+    """Feed a streamed VTT body through VttStreamParser, yielding segment dicts."""
+    parser = VttStreamParser(dedup)
+    async for chunk in chunks:
+        for segment in parser.feed(chunk):
+            yield segment
+    for segment in parser.close():
+        yield segment
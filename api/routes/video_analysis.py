@@ -9,14 +9,15 @@ from services.analysis_service import run_video_transcript_analysis_with_openai
 
 router = APIRouter()
 
+
 @router.post("/video-analysis", response_model=VideoTranscriptAnalysisResponse)
-def video_transcript_analysis(req: VideoTranscriptAnalysisRequest):
+async def video_transcript_analysis(req: VideoTranscriptAnalysisRequest):
     """
     Run fact-checking / analysis on video transcript segments.
     Identifies claims and provides sources with timestamps.
     """
     try:
-        return run_video_transcript_analysis_with_openai(
+        return await run_video_transcript_analysis_with_openai(
             video_id=req.videoId,
             segments=req.segments
         )
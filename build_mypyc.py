@@ -0,0 +1,22 @@
+"""
+Optional: compile the caption parser to a native extension with mypyc.
+
+    pip install mypy
+    python build_mypyc.py build_ext --inplace
+
+The compiled services/vtt_parser*.so is picked up automatically; delete it
+to fall back to the pure-Python module.
+"""
+from setuptools import setup
+from mypyc.build import mypycify
+
+setup(
+    name="um-actually-backend-native",
+    packages=[],
+    py_modules=[],
+    ext_modules=mypycify([
+        "--ignore-missing-imports",
+        "--explicit-package-bases",
+        "services/vtt_parser.py",
+    ]),
+)
@@ -10,11 +10,19 @@ class Settings(BaseSettings):
     # Tavily API for real search results (https://tavily.com)
     # Sign up for free tier at https://app.tavily.com/sign-up
     TAVILY_API_KEY: str = "your-tavily-api-key-here"
+
+    # HEAD-check every search result URL and drop dead links before responding
+    # (adds up to one URL-check timeout to every analysis, so off by default)
+    VERIFY_SOURCE_URLS: bool = False
     
     # YouTube cookies for yt-dlp authentication (base64 encoded)
     # Export from browser, then: base64 < cookies.txt
     # This helps bypass YouTube bot detection on cloud servers
     YOUTUBE_COOKIES_BASE64: str = ""
+
+    # Parse subtitle text that yt-dlp already embedded in the track info
+    # ("data" key) instead of downloading it. Some extractor versions omit it.
+    YOUTUBE_INLINE_SUBTITLES: bool = True
     
     class Config:
         env_file = ".env"
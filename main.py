@@ -1,17 +1,38 @@
+import asyncio
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
+import httpx
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import uvicorn
 from api.routes.text_analysis import router as text_analysis_router
-from api.routes.transcript import router as transcript_router
+from api.routes.transcript import (
+    router as transcript_router,
+    load_cookie_jar,
+    init_ydl_pool,
+    close_ydl_pool,
+)
 from api.routes.video_analysis import router as video_analysis_router
+from services.openai_service import close_openai_client
+from services.search_service import close_search_clients
 import logging
 
-logging.basicConfig(level=logging.INFO)
+# Request threads only enqueue log records; a background listener thread
+# does the (possibly blocking) stream writes
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(_log_queue)])
+_log_listener = QueueListener(_log_queue, logging.StreamHandler())
+_log_listener.start()
+# The shared httpx clients would otherwise log every outbound request at INFO
+logging.getLogger("httpx").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="Um, Actually? API",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -24,8 +45,9 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["Content-Type", "Authorization"],
+    max_age=86400,  # let browsers cache preflight responses for a day
 )
 
 app.include_router(
@@ -47,6 +69,62 @@ app.include_router(
 )
 
 
+# Blocking work (yt-dlp extraction) is pushed onto the default executor;
+# the stock pool is too small to keep concurrent transcript requests overlapping.
+DEFAULT_EXECUTOR_WORKERS = 32
+
+
+@app.on_event("startup")
+async def configure_default_executor():
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=DEFAULT_EXECUTOR_WORKERS))
+
+
+@app.on_event("startup")
+def init_yt_dlp():
+    # Parse the YouTube cookies once instead of per transcript request,
+    # then build the YoutubeDL pool so every instance shares the jar
+    load_cookie_jar()
+    init_ydl_pool()
+
+
+@app.on_event("shutdown")
+def close_yt_dlp():
+    close_ydl_pool()
+
+
+@app.on_event("startup")
+async def open_http_client():
+    # Shared keep-alive pool for outbound downloads (e.g. subtitle files)
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=64, max_connections=128),
+        timeout=15.0,
+        follow_redirects=True,
+    )
+
+
+@app.on_event("shutdown")
+async def close_http_client():
+    await app.state.http.aclose()
+
+
+@app.on_event("shutdown")
+async def close_openai():
+    await close_openai_client()
+
+
+@app.on_event("shutdown")
+async def close_search():
+    await close_search_clients()
+
+
+@app.on_event("shutdown")
+def stop_log_listener():
+    # Flushes any queued records before the process exits
+    _log_listener.stop()
+
+
 # Routes
 @app.get("/")
 async def root():
@@ -25,6 +25,23 @@ class TextAnalysisResponse(BaseModel):
     sourcesList: List[SourceGroup]
 
 
+class ClaimAssessment(BaseModel):
+    # One entry of the model's "claims" array, before sources are searched
+    claim: str = ""
+    claimText: str = ""
+    confidenceReason: str = ""
+    ratingPercent: int = 50
+    searchQuery: Optional[str] = None
+
+
+class TextAnalysisModelOutput(BaseModel):
+    # Raw JSON returned by OpenAI for /text-analysis
+    confidenceScores: int = 0
+    reasoning: str = ""
+    htmlContent: Optional[str] = None
+    claims: List[ClaimAssessment] = []
+
+
 class TextAnalysisRequest(BaseModel):
     # you can expand later (language, url, platform, etc.)
     text: str
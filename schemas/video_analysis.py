@@ -1,6 +1,8 @@
 from pydantic import BaseModel
 from typing import List, Optional
 
+from schemas.text_analysis import ClaimAssessment
+
 
 class TranscriptSegment(BaseModel):
     id: str
@@ -38,3 +40,12 @@ class VideoTranscriptAnalysisResponse(BaseModel):
     reasoning: str
     segments: List[TranscriptSegment]  # Updated with claims identified by OpenAI
     sourcesList: List[SourceGroup]
+
+
+class VideoTranscriptAnalysisModelOutput(BaseModel):
+    # Raw JSON returned by OpenAI for /video-analysis
+    videoId: Optional[str] = None
+    confidenceScores: int = 0
+    reasoning: str = ""
+    segments: List[TranscriptSegment] = []
+    claims: List[ClaimAssessment] = []
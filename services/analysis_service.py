@@ -1,11 +1,57 @@
-import json
-from typing import Dict, Any, List
+import bisect
+import hashlib
+import logging
+import re
+import orjson
+from functools import lru_cache
+from typing import Dict, Any, Iterator, List, Optional, Type, TypeVar, Union
 from datetime import datetime
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import from_json
 
-from schemas.text_analysis import TextAnalysisResponse
-from schemas.video_analysis import VideoTranscriptAnalysisResponse, TranscriptSegment
-from services.openai_service import run_text_analysis
-from services.search_service import search_for_claim, TRUSTED_FACT_CHECK_DOMAINS
+from config import settings
+from schemas.text_analysis import ClaimAssessment, TextAnalysisModelOutput, TextAnalysisResponse
+from schemas.video_analysis import (
+    VideoTranscriptAnalysisModelOutput,
+    VideoTranscriptAnalysisResponse,
+    TranscriptSegment,
+)
+from services.cache import TTLCache
+from services.openai_service import astream_text_analysis
+from services.search_service import (
+    ClaimSearchPool,
+    TRUSTED_FACT_CHECK_DOMAINS,
+    drop_unreachable_sources,
+)
+
+logger = logging.getLogger(__name__)
+
+ModelOutput = TypeVar("ModelOutput", bound=BaseModel)
+
+# Validated completions keyed by (system prompt, date, payload); only output
+# that parsed into its model is stored, so a bad reply is retried next time
+RESPONSE_CACHE_TTL_SECONDS = 3600
+_response_cache = TTLCache(maxsize=512, ttl=RESPONSE_CACHE_TTL_SECONDS)
+
+STANCE_MOSTLY = "Mostly Support"
+STANCE_PARTIAL = "Partially Support"
+
+# Shorter (stripped) text inputs are answered without calling OpenAI
+MIN_TEXT_ANALYSIS_CHARS = 10
+
+# Top trusted domains passed to every claim search (a tuple, so it is also
+# usable as-is in the search cache key)
+TRUSTED_TOP_DOMAINS = tuple(TRUSTED_FACT_CHECK_DOMAINS[:10])
+
+# OpenAI JSON mode: the completion is always a syntactically valid JSON object
+JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+# Segments are sent to OpenAI without any existing claim markers
+_SEGMENT_LIST_ADAPTER = TypeAdapter(List[TranscriptSegment])
+_SEGMENT_PAYLOAD_FIELDS = {"__all__": {"id", "text", "startTime", "endTime"}}
+
+# Start of the "claims" array in a (partial) model response
+_CLAIMS_ARRAY_RE = re.compile(r'"claims"\s*:\s*\[')
 
 
 def get_current_date_string() -> str:
@@ -13,11 +59,185 @@ def get_current_date_string() -> str:
     return datetime.now().strftime("%B %d, %Y")
 
 
+@lru_cache(maxsize=2)
+def _current_date_context(current_date: str) -> str:
+    # The date only changes daily, so the formatted message is reused
+    return _DATE_PROMPT_HEAD + current_date + _DATE_PROMPT_TAIL
+
+
+def _without_claims(segments: List[TranscriptSegment]) -> Iterator[TranscriptSegment]:
+    """
+    Copies of segments with any claim markers cleared. The fields come from
+    already-validated models, so validation is skipped (model_construct).
+    """
+    for seg in segments:
+        yield TranscriptSegment.model_construct(
+            id=seg.id, text=seg.text, startTime=seg.startTime, endTime=seg.endTime
+        )
+
+
+def _source_group(claim_data: ClaimAssessment, search_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Convert one claim and its search results to a SourceGroup dict."""
+    claim_reference = claim_data.claimText
+
+    # Stance is a heuristic - higher search scores generally mean more
+    # relevant/supportive; anything lower defaults to partial support
+    sources = [
+        {
+            "title": result.get("title", "Unknown Source"),
+            "url": result.get("url", ""),
+            "snippet": result.get("snippet", ""),
+            "datePosted": result.get("published_date", "Unknown"),
+            "ratingStance": STANCE_MOSTLY if result.get("score", 0) > 0.8 else STANCE_PARTIAL,
+            "claimReference": claim_reference,
+        }
+        for result in search_results
+    ]
+
+    # If no sources found from search, note this
+    if not sources:
+        sources.append({
+            "title": "No verified sources found",
+            "url": "",
+            "snippet": "Unable to find verified sources for this claim. Please verify independently.",
+            "datePosted": "",
+            "ratingStance": STANCE_PARTIAL,
+            "claimReference": claim_reference,
+        })
+
+    return {
+        "claim": claim_data.claim,
+        "confidenceReason": claim_data.confidenceReason,
+        "ratingPercent": claim_data.ratingPercent,
+        "sources": sources,
+    }
+
+
+def _claim_search_pool() -> ClaimSearchPool:
+    return ClaimSearchPool(
+        max_results=3,
+        include_domains=TRUSTED_TOP_DOMAINS
+    )
+
+
+def _response_cache_key(
+    system_prompt: str,
+    current_date: str,
+    user_payload: Union[Dict[str, Any], str],
+) -> str:
+    raw = orjson.dumps(
+        {"s": system_prompt, "d": current_date, "u": user_payload},
+        option=orjson.OPT_SORT_KEYS,
+    )
+    return hashlib.blake2b(raw, digest_size=32).hexdigest()
+
+
+def _claim_query(claim: Any, search_query: Any) -> str:
+    return claim if search_query is None else search_query
+
+
+async def search_claims(
+    claims: List[ClaimAssessment],
+    searches: ClaimSearchPool
+) -> List[List[Dict[str, Any]]]:
+    """
+    Search for real sources for every claim (Tavily calls run concurrently,
+    and searches already started while streaming are reused).
+    Sources whose URL is unreachable are dropped when VERIFY_SOURCE_URLS is on.
+    Returns one result list per claim, in order.
+    """
+    results = await searches.aresults([
+        _claim_query(claim_data.claim, claim_data.searchQuery)
+        for claim_data in claims
+    ])
+    if settings.VERIFY_SOURCE_URLS:
+        results = await drop_unreachable_sources(results)
+    return results
+
+
+async def run_analysis_streaming(
+    system_prompt: str,
+    user_payload: Union[Dict[str, Any], str],
+    output_model: Type[ModelOutput],
+    searches: ClaimSearchPool,
+    prompt_cache_key: Optional[str] = None
+) -> ModelOutput:
+    """
+    Stream the OpenAI completion and parse it into output_model (raises
+    ValidationError if the model's reply doesn't fit it).
+    The current date is sent after the static system prompt.
+    Each entry of the response's "claims" array is handed to `searches` as
+    soon as it is complete, so Tavily lookups overlap with the rest of the
+    generation instead of starting after it.
+    Identical calls within RESPONSE_CACHE_TTL_SECONDS reuse the last
+    completion that validated.
+    """
+    current_date = get_current_date_string()
+    cache_key = _response_cache_key(system_prompt, current_date, user_payload)
+    cached = _response_cache.get(cache_key)
+    if cached is not None:
+        return output_model.model_validate_json(cached)
+
+    raw = ""
+    scanned = 0
+    claims_at = -1
+    submitted = 0
+
+    async for delta in astream_text_analysis(
+        system_prompt=system_prompt,
+        system_context=_current_date_context(current_date),
+        user_payload=user_payload,
+        model="gpt-4.1",
+        temperature=0.1,
+        prompt_cache_key=prompt_cache_key,
+        response_format=JSON_RESPONSE_FORMAT,
+    ):
+        raw += delta
+
+        if claims_at == -1:
+            # Only rescan the new text (plus enough overlap for a split key)
+            match = _CLAIMS_ARRAY_RE.search(raw, max(0, scanned - 16))
+            scanned = len(raw)
+            if not match:
+                continue
+            claims_at = match.end() - 1
+        elif "}" not in delta:
+            continue
+
+        try:
+            partial = from_json(raw[claims_at:], allow_partial=True)
+        except ValueError:
+            continue
+        if not isinstance(partial, list):
+            continue
+
+        # The last entry may still be incomplete; it is picked up next time
+        for claim_data in partial[submitted:-1]:
+            if isinstance(claim_data, dict):
+                query = _claim_query(claim_data.get("claim", ""), claim_data.get("searchQuery"))
+                if isinstance(query, str):
+                    searches.submit(query)
+        submitted = max(submitted, len(partial) - 1)
+
+    # Log the raw OpenAI response for debugging (formatted only when enabled)
+    logger.debug("Raw OpenAI response:\n%s", raw)
+
+    data = output_model.model_validate_json(raw)
+    _response_cache.set(cache_key, raw)
+    return data
+
+
+# The system prompts are kept byte-for-byte static so OpenAI's automatic prompt
+# caching can reuse them as a prefix; the date goes in a separate message after.
+CURRENT_DATE_PROMPT_TEMPLATE = "Today's date is {current_date}."
+_DATE_PROMPT_HEAD, _DATE_PROMPT_TAIL = CURRENT_DATE_PROMPT_TEMPLATE.split("{current_date}")
+
+
 # Updated prompt that focuses on identifying claims, not generating URLs
-TEXT_ANALYSIS_SYSTEM_PROMPT_TEMPLATE = """
+TEXT_ANALYSIS_SYSTEM_PROMPT = """
 You are a fact-checking and text analysis assistant.
 
-IMPORTANT: Today's date is {current_date}. Your training data may be outdated.
+IMPORTANT: Today's date is given at the end of these instructions. Your training data may be outdated.
 When assessing claims about recent events, do NOT mark them as "future events" or "unverifiable" 
 simply because they occurred after your training cutoff. Real-time search results will be used
 to verify these claims, and you should generate appropriate search queries for them.
@@ -25,22 +245,22 @@ to verify these claims, and you should generate appropriate search queries for t
 Your job is to identify factual claims in the text and assess their verifiability.
 DO NOT make up URLs or sources - real sources will be found separately.
 
-Return ONLY a single JSON object with this exact structure:
+Respond with a JSON object with this structure:
 
-{{
+{
   "confidenceScores": number,
   "reasoning": string,
   "htmlContent": string,
   "claims": [
-    {{
+    {
       "claim": string,
       "claimText": string,
       "confidenceReason": string,
       "ratingPercent": number,
       "searchQuery": string
-    }}
+    }
   ]
-}}
+}
 
 Requirements:
 - "confidenceScores" = overall confidence in the factual accuracy of the WHOLE text (0-100).
@@ -61,100 +281,58 @@ Focus on identifying verifiable factual claims - dates, statistics, events, scie
 """
 
 
-def run_text_analysis_with_openai(text: str) -> TextAnalysisResponse:
+async def run_text_analysis_with_openai(text: str) -> TextAnalysisResponse:
+    # Too little text to hold a checkable claim; skip the OpenAI/Tavily calls
+    if len(text.strip()) < MIN_TEXT_ANALYSIS_CHARS:
+        return TextAnalysisResponse(
+            confidenceScores=100,
+            reasoning="Input too short to fact-check.",
+            htmlContent=text,
+            sourcesList=[],
+        )
+
     user_payload = {"text": text}
     
-    # Format the prompt with the current date
-    system_prompt = TEXT_ANALYSIS_SYSTEM_PROMPT_TEMPLATE.format(
-        current_date=get_current_date_string()
-    )
-
-    raw = run_text_analysis(
-        system_prompt=system_prompt,
-        user_payload=user_payload,
-        model="gpt-4.1",
-        temperature=0.1,
-    )
-
-    try:
-        data: Dict[str, Any] = json.loads(raw)
-    except json.JSONDecodeError:
-        data = {
-            "confidenceScores": 0,
-            "reasoning": "Model returned invalid JSON.",
-            "htmlContent": text,
-            "claims": [],
-        }
+    with _claim_search_pool() as searches:
+        try:
+            data = await run_analysis_streaming(
+                TEXT_ANALYSIS_SYSTEM_PROMPT,
+                user_payload,
+                TextAnalysisModelOutput,
+                searches,
+                prompt_cache_key="text-analysis-v1",
+            )
+        except ValidationError:
+            data = TextAnalysisModelOutput(
+                reasoning="Model returned invalid JSON.",
+                htmlContent=text,
+            )
 
-    # Now search for real sources for each claim
-    claims = data.get("claims", [])
-    sources_list = []
+        # Now search for real sources for each claim
+        claims = data.claims
     
-    for i, claim_data in enumerate(claims):
-        claim_text = claim_data.get("claim", "")
-        search_query = claim_data.get("searchQuery", claim_text)
-        
         # Search for real sources using Tavily
-        search_results = search_for_claim(
-            search_query,
-            max_results=3,
-            include_domains=TRUSTED_FACT_CHECK_DOMAINS[:10]  # Top trusted domains
-        )
-        
-        # Convert search results to our source format
-        sources = []
-        for result in search_results:
-            # Determine stance based on search result score and content
-            # This is a heuristic - higher scores generally mean more relevant/supportive
-            score = result.get("score", 0)
-            if score > 0.8:
-                stance = "Mostly Support"
-            elif score > 0.5:
-                stance = "Partially Support"
-            else:
-                stance = "Partially Support"  # Default to partial for found sources
-                
-            sources.append({
-                "title": result.get("title", "Unknown Source"),
-                "url": result.get("url", ""),
-                "snippet": result.get("snippet", ""),
-                "datePosted": result.get("published_date", "Unknown"),
-                "ratingStance": stance,
-                "claimReference": claim_data.get("claimText", ""),
-            })
-        
-        # If no sources found from search, note this
-        if not sources:
-            sources.append({
-                "title": "No verified sources found",
-                "url": "",
-                "snippet": "Unable to find verified sources for this claim. Please verify independently.",
-                "datePosted": "",
-                "ratingStance": "Partially Support",
-                "claimReference": claim_data.get("claimText", ""),
-            })
-        
-        sources_list.append({
-            "claim": claim_text,
-            "confidenceReason": claim_data.get("confidenceReason", ""),
-            "ratingPercent": claim_data.get("ratingPercent", 50),
-            "sources": sources,
-        })
+        claim_search_results = await search_claims(claims, searches)
+
+    sources_list = [
+        _source_group(claim_data, search_results)
+        for claim_data, search_results in zip(claims, claim_search_results)
+    ]
     
     # Build final response
     return TextAnalysisResponse(
-        confidenceScores=data.get("confidenceScores", 0),
-        reasoning=data.get("reasoning", ""),
-        htmlContent=data.get("htmlContent", text),
+        confidenceScores=data.confidenceScores,
+        reasoning=data.reasoning,
+        htmlContent=text if data.htmlContent is None else data.htmlContent,
         sourcesList=sources_list,
     )
 
 
 # Updated video transcript prompt - focuses on claim identification
-VIDEO_TRANSCRIPT_ANALYSIS_SYSTEM_PROMPT_TEMPLATE = """
+VIDEO_TRANSCRIPT_ANALYSIS_SYSTEM_PROMPT = """
 You are a fact-checking assistant for video transcript analysis.
 
-IMPORTANT: Today's date is {current_date}. Your training data may be outdated.
+IMPORTANT: Today's date is given at the end of these instructions. Your training data may be outdated.
 When assessing claims about recent events, do NOT mark them as "future events" or "unverifiable" 
 simply because they occurred after your training cutoff. Real-time search results will be used
 to verify these claims, and you should generate appropriate search queries for them.
@@ -168,32 +346,32 @@ You will receive a list of transcript segments with timestamps. Each segment has
 Your job is to identify factual claims that can be verified.
 DO NOT make up URLs or sources - real sources will be found separately.
 
-Return ONLY a single JSON object with this exact structure:
+Respond with a JSON object with this structure:
 
-{{
+{
   "videoId": string,
   "confidenceScores": number,
   "reasoning": string,
   "segments": [
-    {{
+    {
       "id": string,
       "text": string,
       "startTime": number,
       "endTime": number,
       "claim": string (optional),
       "claimIndex": number (optional)
-    }}
+    }
   ],
   "claims": [
-    {{
+    {
       "claim": string,
       "claimText": string,
       "confidenceReason": string,
       "ratingPercent": number,
       "searchQuery": string
-    }}
+    }
   ]
-}}
+}
 
 Requirements:
 - "confidenceScores" = overall confidence in the factual accuracy (0-100).
@@ -202,7 +380,7 @@ Requirements:
 CRITICAL REQUIREMENT - You MUST return ALL segments:
 - "segments" array MUST contain EVERY SINGLE segment from the input, in the SAME order.
 - Count the input segments and return the EXACT same number.
-- For segments WITHOUT claims: include them with only {{id, text, startTime, endTime}}.
+- For segments WITHOUT claims: include them with only {id, text, startTime, endTime}.
 - For segments WITH claims: add "claim" and "claimIndex" fields.
 - Most segments will NOT have claims - that's normal and expected.
 
@@ -225,7 +403,7 @@ Focus on identifying verifiable factual claims - dates, statistics, events, scie
 """
 
 
-def run_video_transcript_analysis_with_openai(
+async def run_video_transcript_analysis_with_openai(
     video_id: str,
     segments: List[TranscriptSegment]
 ) -> VideoTranscriptAnalysisResponse:
@@ -234,134 +412,89 @@ def run_video_transcript_analysis_with_openai(
     Only analyzes the first 3 minutes to save on API costs.
     Uses real search to find verified sources for claims.
     """
-    # Convert segments to dict for JSON serialization
-    all_segments_data = [
-        {
-            "id": seg.id,
-            "text": seg.text,
-            "startTime": seg.startTime,
-            "endTime": seg.endTime
-        }
-        for seg in segments
-    ]
-
-    # Filter to only first 3 minutes (180 seconds) for OpenAI analysis
+    # Filter to only first 3 minutes (180 seconds) for OpenAI analysis.
+    # Segments are in time order, so one binary search finds the split.
     MAX_DURATION_SECONDS = 180
-    segments_to_analyze = [
-        seg for seg in all_segments_data
-        if seg["startTime"] < MAX_DURATION_SECONDS
-    ]
+    split = bisect.bisect_left(segments, MAX_DURATION_SECONDS, key=lambda seg: seg.startTime)
+    segments_to_analyze = segments[:split]
 
-    print(f"\n>>> Total segments: {len(all_segments_data)}, analyzing first 3 minutes: {len(segments_to_analyze)} segments")
-    print(f">>> First segment: {segments_to_analyze[0] if segments_to_analyze else 'None'}")
-    print(f">>> Last segment to analyze: {segments_to_analyze[-1] if segments_to_analyze else 'None'}")
+    logger.debug(
+        "Total segments: %d, analyzing first 3 minutes: %d segments",
+        len(segments), len(segments_to_analyze)
+    )
 
-    user_payload = {
-        "videoId": video_id,
-        "segments": segments_to_analyze
-    }
+    if not any(seg.text.strip() for seg in segments_to_analyze):
+        return VideoTranscriptAnalysisResponse(
+            videoId=video_id,
+            confidenceScores=0,
+            reasoning="No content in first 3 minutes.",
+            segments=list(_without_claims(segments)),
+            sourcesList=[],
+        )
 
-    # Format the prompt with the current date
-    system_prompt = VIDEO_TRANSCRIPT_ANALYSIS_SYSTEM_PROMPT_TEMPLATE.format(
-        current_date=get_current_date_string()
-    )
+    # Serialized straight to JSON by pydantic-core, without per-segment dicts
+    user_payload = (
+        b'{"videoId":' + orjson.dumps(video_id)
+        + b',"segments":' + _SEGMENT_LIST_ADAPTER.dump_json(
+            segments_to_analyze, include=_SEGMENT_PAYLOAD_FIELDS
+        )
+        + b'}'
+    ).decode()
+
+    with _claim_search_pool() as searches:
+        try:
+            data = await run_analysis_streaming(
+                VIDEO_TRANSCRIPT_ANALYSIS_SYSTEM_PROMPT,
+                user_payload,
+                VideoTranscriptAnalysisModelOutput,
+                searches,
+                prompt_cache_key="video-analysis-v1",
+            )
+            logger.debug(
+                "Parsed data: videoId=%s, segments=%d, claims=%d",
+                data.videoId, len(data.segments), len(data.claims)
+            )
 
-    raw = run_text_analysis(
-        system_prompt=system_prompt,
-        user_payload=user_payload,
-        model="gpt-4.1",
-        temperature=0.1,
-    )
+            # Merge analyzed segments with remaining segments (after 3 minutes)
+            analyzed_count = len(data.segments)
+            remaining_segments = segments[split:]
+
+            # Combine: analyzed segments (first 3 min) + remaining segments (rest of video),
+            # extending the parsed list in place rather than copying both into a new one
+            all_segments_with_claims = data.segments
+            all_segments_with_claims.extend(_without_claims(remaining_segments))
+
+            logger.info(
+                "Video %s: %d analyzed + %d remaining segments, %d claims",
+                video_id, analyzed_count, len(remaining_segments), len(data.claims)
+            )
 
-    # Log the raw OpenAI response for debugging
-    print("\n" + "="*80)
-    print("RAW OPENAI RESPONSE FOR VIDEO ANALYSIS:")
-    print("="*80)
-    print(raw)
-    print("="*80 + "\n")
-
-    try:
-        data: Dict[str, Any] = json.loads(raw)
-        print(f"Parsed data: videoId={data.get('videoId')}, segments={len(data.get('segments', []))}, claims={len(data.get('claims', []))}")
-
-        # Merge analyzed segments with remaining segments (after 3 minutes)
-        analyzed_segments = data.get('segments', [])
-        remaining_segments = [
-            seg for seg in all_segments_data
-            if seg["startTime"] >= MAX_DURATION_SECONDS
-        ]
-
-        # Combine: analyzed segments (first 3 min) + remaining segments (rest of video)
-        all_segments_with_claims = analyzed_segments + remaining_segments
-        data['segments'] = all_segments_with_claims
-
-        print(f"Final: {len(analyzed_segments)} analyzed + {len(remaining_segments)} remaining = {len(all_segments_with_claims)} total segments")
-
-        # Now search for real sources for each identified claim
-        claims = data.get("claims", [])
-        sources_list = []
+            # Now search for real sources for each identified claim
+            claims = data.claims
         
-        for i, claim_data in enumerate(claims):
-            claim_text = claim_data.get("claim", "")
-            search_query = claim_data.get("searchQuery", claim_text)
-            
-            print(f"Searching for claim {i}: {claim_text[:50]}...")
-            
             # Search for real sources using Tavily
-            search_results = search_for_claim(
-                search_query,
-                max_results=3,
-                include_domains=TRUSTED_FACT_CHECK_DOMAINS[:10]
-            )
-            
-            # Convert search results to our source format
-            sources = []
-            for result in search_results:
-                score = result.get("score", 0)
-                if score > 0.8:
-                    stance = "Mostly Support"
-                elif score > 0.5:
-                    stance = "Partially Support"
-                else:
-                    stance = "Partially Support"
-                    
-                sources.append({
-                    "title": result.get("title", "Unknown Source"),
-                    "url": result.get("url", ""),
-                    "snippet": result.get("snippet", ""),
-                    "datePosted": result.get("published_date", "Unknown"),
-                    "ratingStance": stance,
-                    "claimReference": claim_data.get("claimText", ""),
-                })
-            
-            if not sources:
-                sources.append({
-                    "title": "No verified sources found",
-                    "url": "",
-                    "snippet": "Unable to find verified sources for this claim. Please verify independently.",
-                    "datePosted": "",
-                    "ratingStance": "Partially Support",
-                    "claimReference": claim_data.get("claimText", ""),
-                })
-            
-            sources_list.append({
-                "claim": claim_text,
-                "confidenceReason": claim_data.get("confidenceReason", ""),
-                "ratingPercent": claim_data.get("ratingPercent", 50),
-                "sources": sources,
-            })
+            claim_search_results = await search_claims(claims, searches)
+
+            sources_list = [
+                _source_group(claim_data, search_results)
+                for claim_data, search_results in zip(claims, claim_search_results)
+            ]
         
-        data['sourcesList'] = sources_list
-
-    except json.JSONDecodeError as e:
-        # Fallback if OpenAI returns invalid JSON
-        print(f"ERROR: Failed to parse OpenAI JSON response: {e}")
-        data = {
-            "videoId": video_id,
-            "confidenceScores": 0,
-            "reasoning": "Model returned invalid JSON.",
-            "segments": all_segments_data,
-            "sourcesList": [],
-        }
+            return VideoTranscriptAnalysisResponse.model_validate({
+                "videoId": data.videoId or video_id,
+                "confidenceScores": data.confidenceScores,
+                "reasoning": data.reasoning,
+                "segments": all_segments_with_claims,
+                "sourcesList": sources_list,
+            })
 
-    return VideoTranscriptAnalysisResponse(**data)
+        except ValidationError as e:
+            # Fallback if OpenAI returns invalid JSON
+            logger.error("Failed to parse OpenAI JSON response: %s", e)
+            return VideoTranscriptAnalysisResponse(
+                videoId=video_id,
+                confidenceScores=0,
+                reasoning="Model returned invalid JSON.",
+                segments=list(_without_claims(segments)),
+                sourcesList=[],
+            )
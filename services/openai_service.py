@@ -1,51 +1,106 @@
 # app/services/openai_service.py
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 from functools import lru_cache
-from openai import OpenAI
+import httpx
+import orjson
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 
 from config import settings
 
 
 @lru_cache(maxsize=1)
-def get_openai_client() -> OpenAI:
+def get_async_openai_client() -> AsyncOpenAI:
     """
-    Singleton-style OpenAI client so we don't recreate it everywhere.
+    Singleton-style AsyncOpenAI client so we don't recreate it everywhere.
+    Backed by one keep-alive connection pool, so repeated analyses reuse
+    open TLS connections to the API instead of handshaking per call, and
+    waiting on a completion costs no worker thread.
     """
-    return OpenAI(api_key=settings.OPENAI_API_KEY)
+    return AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        # The SDK's own client class, so its default timeouts (600 s per
+        # request, 5 s to connect) and redirect handling are kept
+        http_client=DefaultAsyncHttpxClient(
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        ),
+    )
+
+
+async def close_openai_client() -> None:
+    """Close the shared client's connection pool, if it was ever created."""
+    if get_async_openai_client.cache_info().currsize:
+        await get_async_openai_client().close()
+        get_async_openai_client.cache_clear()
+
+
+def _completion_request(
+    system_prompt: str,
+    user_payload: Union[Dict[str, Any], str],
+    model: Optional[str],
+    temperature: Optional[float],
+    system_context: Optional[str],
+    prompt_cache_key: Optional[str],
+    response_format: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """chat.completions.create kwargs for one call."""
+    m = model or settings.OPENAI_TEXT_MODEL
+    t = settings.OPENAI_TEMPERATURE if temperature is None else temperature
+
+    # Static instructions first so they form a cacheable prompt prefix
+    messages: List[Dict[str, str]] = [{"role": "system", "content": system_prompt}]
+    if system_context:
+        messages.append({"role": "system", "content": system_context})
+    if not isinstance(user_payload, str):
+        user_payload = orjson.dumps(user_payload).decode()
+    messages.append({"role": "user", "content": user_payload})
 
+    request: Dict[str, Any] = {
+        "model": m,
+        "messages": messages,
+        "temperature": t,
+        "stream": True,
+    }
+    if prompt_cache_key:
+        request["prompt_cache_key"] = prompt_cache_key
+    if response_format:
+        request["response_format"] = response_format
 
-def run_text_analysis(
+    return request
+
+
+async def astream_text_analysis(
     *,
     system_prompt: str,
-    user_payload: Dict[str, Any],
+    user_payload: Union[Dict[str, Any], str],
     model: Optional[str] = None,
     temperature: Optional[float] = None,
-) -> str:
+    system_context: Optional[str] = None,
+    prompt_cache_key: Optional[str] = None,
+    response_format: Optional[Dict[str, Any]] = None,
+) -> AsyncIterator[str]:
     """
-    Generic helper for calling a chat/completions model and returning raw content string.
+    Generic helper for calling a chat/completions model, yielding the
+    completion's content in pieces as the model generates it, so callers can
+    act on early output.
 
     - system_prompt: instructions for the assistant
-    - user_payload: arbitrary dict sent as the user message (we JSON-encode it)
+    - user_payload: arbitrary dict sent as the user message (we JSON-encode it),
+      or an already-encoded JSON string sent as-is
     - model: override model if needed; otherwise uses default from settings
     - temperature: override temperature if needed
+    - system_context: short, changing instructions (e.g. today's date) sent
+      after system_prompt so the static prompt stays a cacheable prefix
+    - prompt_cache_key: routing hint for OpenAI's prompt cache
+    - response_format: e.g. {"type": "json_object"} to force valid JSON output
     """
-    client = get_openai_client()
-
-    m = model or settings.OPENAI_TEXT_MODEL
-    t = settings.OPENAI_TEMPERATURE if temperature is None else temperature
-
-    import json
-
-    messages: List[Dict[str, str]] = [
-        {"role": "system", "content": system_prompt},
-        {"role": "user", "content": json.dumps(user_payload)},
-    ]
-
-    completion = client.chat.completions.create(
-        model=m,
-        messages=messages,
-        temperature=t,
+    request = _completion_request(
+        system_prompt, user_payload, model, temperature,
+        system_context, prompt_cache_key, response_format,
     )
-
-    return completion.choices[0].message.content or ""
+    async for chunk in await get_async_openai_client().chat.completions.create(**request):
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            yield delta
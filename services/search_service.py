@@ -3,18 +3,47 @@
 Search service for finding real, verified sources for fact-checking claims.
 Uses Tavily API which is designed for AI/LLM search and provides reliable sources.
 """
+import asyncio
 import logging
-from typing import List, Optional, Dict, Any
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, Sequence
 from tavily import TavilyClient
 import httpx
 
 from config import settings
+from services.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent Tavily requests across all analyses
+SEARCH_MAX_WORKERS = 16
 
+# Search results keyed by (claim, max_results, include_domains, search_depth)
+SEARCH_CACHE_TTL_SECONDS = 3600
+_search_cache = TTLCache(maxsize=1024, ttl=SEARCH_CACHE_TTL_SECONDS)
+
+URL_CHECK_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; UmActually/1.0)"}
+URL_CHECK_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+# One dispatch pool for every analysis, plus the searches currently running
+# in it so concurrent requests for the same claim share a single Tavily call
+_search_executor = ThreadPoolExecutor(max_workers=SEARCH_MAX_WORKERS, thread_name_prefix="tavily")
+_inflight_searches: Dict[tuple, Future] = {}
+_inflight_lock = threading.Lock()
+
+# Shared keep-alive clients for source URL checks, created on first use
+_url_check_client: Optional[httpx.AsyncClient] = None
+_url_check_client_sync: Optional[httpx.Client] = None
+
+
+@lru_cache(maxsize=1)
 def get_tavily_client() -> Optional[TavilyClient]:
-    """Get Tavily client if API key is configured."""
+    """
+    Get Tavily client if API key is configured.
+    One client is shared so its HTTP session keeps connections alive.
+    """
     if not settings.TAVILY_API_KEY or settings.TAVILY_API_KEY == "your-tavily-api-key-here":
         logger.warning("Tavily API key not configured - search features disabled")
         return None
@@ -24,7 +53,7 @@ def get_tavily_client() -> Optional[TavilyClient]:
 def search_for_claim(
     claim: str,
     max_results: int = 3,
-    include_domains: Optional[List[str]] = None,
+    include_domains: Optional[Sequence[str]] = None,
     search_depth: str = "basic"
 ) -> List[Dict[str, Any]]:
     """
@@ -38,7 +67,14 @@ def search_for_claim(
         
     Returns:
         List of source dictionaries with url, title, content, score, published_date
+
+    Successful searches are cached for SEARCH_CACHE_TTL_SECONDS; failures are not.
     """
+    cache_key = (claim, max_results, tuple(include_domains or ()), search_depth)
+    cached = _search_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     client = get_tavily_client()
     if not client:
         return []
@@ -55,7 +91,7 @@ def search_for_claim(
         }
         
         if include_domains:
-            search_params["include_domains"] = include_domains
+            search_params["include_domains"] = list(include_domains)
             
         response = client.search(**search_params)
         
@@ -69,7 +105,8 @@ def search_for_claim(
                 "published_date": result.get("published_date", ""),
             })
             
-        logger.info(f"Found {len(results)} sources for claim: {claim[:50]}...")
+        logger.debug("Found %d sources for claim: %.50s...", len(results), claim)
+        _search_cache.set(cache_key, results)
         return results
         
     except Exception as e:
@@ -77,6 +114,132 @@ def search_for_claim(
         return []
 
 
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a search query."""
+    return " ".join(query.split()).lower()
+
+
+def submit_search(
+    claim: str,
+    max_results: int = 3,
+    include_domains: Optional[Sequence[str]] = None,
+    search_depth: str = "basic"
+) -> Future:
+    """
+    Start search_for_claim on the shared search pool and return its future.
+    If an identical search is already running (from this or another
+    request), its future is returned instead of issuing a second call.
+    Queries differing only in case or spacing count as identical; the first
+    one seen is what gets sent to Tavily.
+    """
+    key = (normalize_query(claim), max_results, tuple(include_domains or ()), search_depth)
+
+    with _inflight_lock:
+        future = _inflight_searches.get(key)
+        if future is not None:
+            return future
+        future = _search_executor.submit(
+            search_for_claim,
+            claim,
+            max_results=max_results,
+            include_domains=include_domains,
+            search_depth=search_depth,
+        )
+        _inflight_searches[key] = future
+
+    def forget(done: Future) -> None:
+        with _inflight_lock:
+            if _inflight_searches.get(key) is done:
+                del _inflight_searches[key]
+
+    # Finished results live on in the search cache
+    future.add_done_callback(forget)
+    return future
+
+
+class ClaimSearchPool:
+    """
+    Tracks the claim searches of one analysis, run on the shared search pool.
+    submit() starts a search as soon as its query is known (e.g. while the
+    model is still generating the rest of its answer); results() waits for
+    the searches of the given queries, starting any not yet submitted.
+    Repeated queries (ignoring case and spacing) share one search.
+    Use as a context manager.
+    """
+
+    def __init__(
+        self,
+        max_results: int = 3,
+        include_domains: Optional[Sequence[str]] = None,
+        search_depth: str = "basic"
+    ):
+        self.max_results = max_results
+        self.include_domains = include_domains
+        self.search_depth = search_depth
+        self._futures: Dict[str, Future] = {}
+
+    def submit(self, query: str) -> None:
+        key = normalize_query(query)
+        if key not in self._futures:
+            self._futures[key] = submit_search(
+                query,
+                max_results=self.max_results,
+                include_domains=self.include_domains,
+                search_depth=self.search_depth,
+            )
+
+    def results(self, queries: List[str]) -> List[List[Dict[str, Any]]]:
+        """One result list per query, in the same order as queries."""
+        for query in queries:
+            self.submit(query)
+        return [self._futures[normalize_query(query)].result() for query in queries]
+
+    async def aresults(self, queries: List[str]) -> List[List[Dict[str, Any]]]:
+        """
+        Like results(), but awaits the searches instead of blocking.
+        Cancelling the caller leaves the searches running: they may be
+        shared with other requests, and wrap_future alone would cancel them.
+        """
+        for query in queries:
+            self.submit(query)
+        return list(await asyncio.gather(*(
+            asyncio.shield(asyncio.wrap_future(self._futures[normalize_query(query)]))
+            for query in queries
+        )))
+
+    def close(self) -> None:
+        # Unclaimed searches may be shared with other requests, so they are
+        # left to finish (and fill the search cache) rather than cancelled
+        self._futures.clear()
+
+    def __enter__(self) -> "ClaimSearchPool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def search_for_claims_parallel(
+    queries: List[str],
+    max_results: int = 3,
+    include_domains: Optional[Sequence[str]] = None,
+    search_depth: str = "basic"
+) -> List[List[Dict[str, Any]]]:
+    """
+    Run search_for_claim for every query concurrently.
+    Each search is an independent network round-trip, so the total wait is
+    roughly the slowest search rather than the sum of all of them.
+
+    Returns:
+        One result list per query, in the same order as queries
+    """
+    if not queries:
+        return []
+
+    with ClaimSearchPool(max_results, include_domains, search_depth) as pool:
+        return pool.results(queries)
+
+
 def search_for_claims_batch(
     claims: List[str],
     max_results_per_claim: int = 2
@@ -91,13 +254,50 @@ def search_for_claims_batch(
     Returns:
         Dictionary mapping each claim to its found sources
     """
-    results = {}
-    for claim in claims:
-        results[claim] = search_for_claim(
-            claim,
-            max_results=max_results_per_claim
+    found = search_for_claims_parallel(claims, max_results=max_results_per_claim)
+    return dict(zip(claims, found))
+
+
+def _get_url_check_client() -> httpx.AsyncClient:
+    global _url_check_client
+    if _url_check_client is None:
+        _url_check_client = httpx.AsyncClient(
+            http2=True,
+            limits=URL_CHECK_LIMITS,
+            headers=URL_CHECK_HEADERS,
+            follow_redirects=True,
         )
-    return results
+    return _url_check_client
+
+
+def _get_url_check_client_sync() -> httpx.Client:
+    global _url_check_client_sync
+    if _url_check_client_sync is None:
+        _url_check_client_sync = httpx.Client(
+            http2=True,
+            limits=URL_CHECK_LIMITS,
+            headers=URL_CHECK_HEADERS,
+            follow_redirects=True,
+        )
+    return _url_check_client_sync
+
+
+async def close_search_clients() -> None:
+    """Close the shared HTTP clients (call from the app's shutdown event)."""
+    global _url_check_client, _url_check_client_sync
+
+    if _url_check_client is not None:
+        await _url_check_client.aclose()
+        _url_check_client = None
+    if _url_check_client_sync is not None:
+        _url_check_client_sync.close()
+        _url_check_client_sync = None
+
+    if get_tavily_client.cache_info().currsize:
+        tavily = get_tavily_client()
+        if tavily is not None and hasattr(tavily, "close"):
+            tavily.close()
+        get_tavily_client.cache_clear()
 
 
 async def verify_url_exists(url: str, timeout: float = 5.0) -> bool:
@@ -112,32 +312,51 @@ async def verify_url_exists(url: str, timeout: float = 5.0) -> bool:
         True if URL exists and returns 2xx/3xx status
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.head(
-                url,
-                timeout=timeout,
-                follow_redirects=True,
-                headers={"User-Agent": "Mozilla/5.0 (compatible; UmActually/1.0)"}
-            )
-            return 200 <= response.status_code < 400
+        response = await _get_url_check_client().head(url, timeout=timeout)
+        return 200 <= response.status_code < 400
     except Exception as e:
         logger.debug(f"URL verification failed for {url}: {e}")
         return False
 
 
+async def verify_urls_exist(urls: List[str], timeout: float = 5.0) -> List[bool]:
+    """
+    Check many URLs concurrently over the shared client.
+
+    Returns:
+        One result per URL, in the same order as urls
+    """
+    return list(await asyncio.gather(*(verify_url_exists(url, timeout) for url in urls)))
+
+
+async def drop_unreachable_sources(
+    results: List[List[Dict[str, Any]]],
+    timeout: float = 5.0
+) -> List[List[Dict[str, Any]]]:
+    """
+    Remove search results whose URL does not resolve. Every distinct URL
+    across all result lists is checked at once, so the whole pass takes
+    about one timeout at worst. Returns new lists; the inputs (which may be
+    shared through the search cache) are left untouched.
+    """
+    urls = list({result["url"] for found in results for result in found if result.get("url")})
+    if not urls:
+        return results
+
+    reachable = {url for url, ok in zip(urls, await verify_urls_exist(urls, timeout)) if ok}
+    return [
+        [result for result in found if result.get("url") in reachable]
+        for found in results
+    ]
+
+
 def verify_url_exists_sync(url: str, timeout: float = 5.0) -> bool:
     """
     Synchronous version of URL verification.
     """
     try:
-        with httpx.Client() as client:
-            response = client.head(
-                url,
-                timeout=timeout,
-                follow_redirects=True,
-                headers={"User-Agent": "Mozilla/5.0 (compatible; UmActually/1.0)"}
-            )
-            return 200 <= response.status_code < 400
+        response = _get_url_check_client_sync().head(url, timeout=timeout)
+        return 200 <= response.status_code < 400
     except Exception as e:
         logger.debug(f"URL verification failed for {url}: {e}")
         return False
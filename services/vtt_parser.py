@@ -0,0 +1,265 @@
+# services/vtt_parser.py
+"""
+Caption parsing: WebVTT and YouTube json3 subtitle tracks -> ~5 second
+transcript segments.
+
+This module does no I/O and is fully annotated so it can be compiled with
+mypyc (`mypyc services/vtt_parser.py`). A compiled extension next to this
+file is imported automatically; otherwise the pure-Python module is used.
+"""
+import html
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import orjson
+from pydantic import TypeAdapter
+
+from schemas.transcript import TranscriptSegment
+
+# Captions are grouped until a segment spans at least this many seconds
+SEGMENT_SECONDS = 5.0
+
+# One cue: "[hh:]mm:ss.mmm --> [hh:]mm:ss.mmm <settings>" followed by its text block
+_VTT_CUE_RE = re.compile(
+    r'(?:(\d+):)?(\d{2}):(\d{2}\.\d{3})\s*-->\s*(?:(\d+):)?(\d{2}):(\d{2}\.\d{3})[^\n]*\n'
+    r'((?:[^\n]+\n?)*)'
+)
+# Inline styling/timing tags such as <c>, </c>, <00:00:01.000>
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# A parsed caption cue: (startTime, endTime, text)
+Cue = Tuple[float, float, str]
+# An unvalidated TranscriptSegment
+Segment = Dict[str, Any]
+
+# Validates a whole list of segment dicts in one call (schema compiled once)
+_SEGMENT_LIST_ADAPTER = TypeAdapter(List[TranscriptSegment])
+
+
+def validate_segments(segments: List[Segment]) -> List[TranscriptSegment]:
+    """Turn segment dicts produced by this module into TranscriptSegment models."""
+    return _SEGMENT_LIST_ADAPTER.validate_python(segments)
+
+
+def _iter_vtt_cues(vtt_content: str) -> Iterator[Cue]:
+    """
+    Yield (start, end, text) for each cue in a WebVTT document.
+    A single regex scan covers the timestamp line and the text block up to the
+    next blank line, so headers/NOTE blocks without a timing line are skipped.
+    """
+    for m in _VTT_CUE_RE.finditer(vtt_content.replace("\r\n", "\n")):
+        sh: Optional[str] = m.group(1)
+        eh: Optional[str] = m.group(4)
+        start: float = (int(sh) * 3600 if sh else 0) + int(m.group(2)) * 60 + float(m.group(3))
+        end: float = (int(eh) * 3600 if eh else 0) + int(m.group(5)) * 60 + float(m.group(6))
+
+        block: str = m.group(7)
+        if "<" in block:
+            block = _TAG_RE.sub("", block)
+        # split() drops the line breaks and surrounding whitespace in one pass
+        text: str = " ".join(block.split())
+        if "&" in text:
+            # Character references (&amp;, &nbsp;, ...) are only decoded after
+            # tag removal so an escaped "&lt;" can't be mistaken for a tag
+            text = html.unescape(text).strip()
+        if text:
+            yield start, end, text
+
+
+class _RollingCueDeduper:
+    """
+    YouTube auto-generated captions "roll": each cue repeats the tail of the
+    previous one before adding new words. Strips the longest prefix of a cue
+    that matches the end of the previous cue, dropping cues with nothing new.
+    """
+
+    def __init__(self) -> None:
+        self._prev_words: List[str] = []
+
+    def __call__(self, start: float, end: float, text: str) -> Optional[Cue]:
+        words: List[str] = text.split()
+        prev: List[str] = self._prev_words
+        self._prev_words = words
+
+        overlap: int
+        for overlap in range(min(len(prev), len(words)), 0, -1):
+            if prev[-overlap:] == words[:overlap]:
+                new_words: List[str] = words[overlap:]
+                if not new_words:
+                    return None
+                return start, end, " ".join(new_words)
+
+        return start, end, text
+
+
+def _dedup_rolling_cues(cues: Iterable[Cue]) -> List[Cue]:
+    """Apply _RollingCueDeduper to a sequence of (start, end, text) cues."""
+    dedup = _RollingCueDeduper()
+    deduped: List[Cue] = []
+    for start, end, text in cues:
+        cue = dedup(start, end, text)
+        if cue is not None:
+            deduped.append(cue)
+    return deduped
+
+
+class _SegmentGrouper:
+    """
+    Accumulates parsed cues into ~5 second transcript segments.
+    add() returns a segment whenever one is complete; finish() flushes the rest.
+    Segments are plain dicts; callers validate the whole list once at the end.
+    With dedup=True, rolling duplicates from auto-captions are removed first.
+    """
+
+    def __init__(self, dedup: bool = False) -> None:
+        self.count: int = 0
+        self._start: float = 0.0
+        self._end: float = 0.0
+        self._text: List[str] = []
+        self._dedup: Optional[_RollingCueDeduper] = _RollingCueDeduper() if dedup else None
+
+    def add(self, start: float, end: float, text: str) -> Optional[Segment]:
+        if self._dedup is not None:
+            cue = self._dedup(start, end, text)
+            if cue is None:
+                return None
+            start, end, text = cue
+
+        if not self._text:
+            self._start = start
+        self._text.append(text)
+        self._end = end
+
+        # Break once we've reached 5 seconds or more
+        if end - self._start >= SEGMENT_SECONDS:
+            return self.finish()
+        return None
+
+    def finish(self) -> Optional[Segment]:
+        if not self._text:
+            return None
+
+        segment_text: str = " ".join(self._text)
+        self._text = []
+
+        # Extract first 2 words as claim for highlighting/clicking
+        words: List[str] = segment_text.split()[:2]
+        claim_text: str = " ".join(words) if words else segment_text
+
+        index: int = self.count
+        self.count += 1
+        return {
+            "id": f"seg_{index}",
+            "text": segment_text,
+            "startTime": self._start,
+            "endTime": self._end,
+            "claim": claim_text,
+            "claimIndex": index,
+        }
+
+
+def _group_cues(cues: Iterable[Cue], dedup: bool = False) -> Iterator[Segment]:
+    """Group cues into ~5 second segment dicts, yielding each as it completes."""
+    grouper = _SegmentGrouper(dedup)
+
+    for start, end, text in cues:
+        segment = grouper.add(start, end, text)
+        if segment is not None:
+            yield segment
+
+    last = grouper.finish()
+    if last is not None:
+        yield last
+
+
+def iter_vtt_segments(vtt_content: str, dedup: bool = False) -> Iterator[Segment]:
+    """
+    Parse WebVTT caption format into unvalidated transcript segment dicts.
+    Groups captions into ~5 second chunks for better UX.
+
+    VTT format:
+    WEBVTT
+
+    00:00:00.000 --> 00:00:05.000
+    This is the first caption
+
+    00:00:05.000 --> 00:00:10.000
+    This is the second caption
+
+    dedup=True removes rolling duplicates (use for auto-generated captions).
+    """
+    return _group_cues(_iter_vtt_cues(vtt_content), dedup)
+
+
+class VttStreamParser:
+    """
+    Incremental WebVTT parser for a body that arrives in chunks.
+    feed() parses only complete cue blocks (up to the last blank line seen)
+    and carries the trailing partial cue over to the next chunk, so memory
+    stays bounded by one chunk plus the segment being built. Call close()
+    once the body is exhausted to flush the remainder.
+    """
+
+    def __init__(self, dedup: bool = False) -> None:
+        self._grouper = _SegmentGrouper(dedup)
+        self._buf: str = ""
+
+    def _parse(self, vtt_content: str) -> List[Segment]:
+        segments: List[Segment] = []
+        for start, end, text in _iter_vtt_cues(vtt_content):
+            segment = self._grouper.add(start, end, text)
+            if segment is not None:
+                segments.append(segment)
+        return segments
+
+    def feed(self, chunk: str) -> List[Segment]:
+        buf: str = (self._buf + chunk).replace("\r\n", "\n")
+        cut: int = buf.rfind("\n\n")
+        if cut == -1:
+            self._buf = buf
+            return []
+
+        self._buf = buf[cut:]
+        return self._parse(buf[:cut])
+
+    def close(self) -> List[Segment]:
+        segments = self._parse(self._buf)
+        self._buf = ""
+
+        last = self._grouper.finish()
+        if last is not None:
+            segments.append(last)
+        return segments
+
+
+def _iter_json3_cues(raw: Union[str, bytes]) -> Iterator[Cue]:
+    """
+    Yield (start, end, text) for each caption event in a json3 document.
+    Events without "segs" only carry window/style info and are skipped.
+    """
+    events: List[Dict[str, Any]] = orjson.loads(raw).get("events", [])
+    for event in events:
+        segs: Optional[List[Dict[str, Any]]] = event.get("segs")
+        if not segs:
+            continue
+
+        text: str = " ".join("".join([seg.get("utf8", "") for seg in segs]).split())
+        if not text:
+            continue
+
+        start_ms: int = event.get("tStartMs", 0)
+        yield start_ms / 1000, (start_ms + event.get("dDurationMs", 0)) / 1000, text
+
+
+def iter_json3_segments(raw: Union[str, bytes]) -> Iterator[Segment]:
+    """
+    Parse YouTube's json3 subtitle format into unvalidated transcript segment
+    dicts, grouped the same way as iter_vtt_segments.
+
+    json3 format:
+    {"events": [{"tStartMs": 0, "dDurationMs": 2000,
+                 "segs": [{"utf8": "hello"}, {"utf8": " world"}]}, ...]}
+
+    Auto-caption events hold only new words, so no rolling dedup is needed.
+    """
+    return _group_cues(_iter_json3_cues(raw))
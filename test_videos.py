@@ -3,66 +3,247 @@
 Test script to check which YouTube videos have transcripts available
 """
 
-from youtube_transcript_api import YouTubeTranscriptApi
+import youtube_transcript_api
+from youtube_transcript_api import (
+    CouldNotRetrieveTranscript,
+    NoTranscriptFound,
+    TranscriptsDisabled,
+    YouTubeTranscriptApi,
+)
+import argparse
+import asyncio
+import json
+import os
+import random
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 
-def test_video(video_id):
-    """Test if a video has transcripts available"""
+# Probe results are kept on disk so re-runs on the same IDs skip YouTube
+PROBE_CACHE_PATH = ".transcript_probe_cache.json"
+PROBE_CACHE_TTL_SECONDS = 86400
+
+DEFAULT_CONCURRENCY = 8
+
+# Checked when no video IDs are given on the command line
+EXAMPLE_VIDEOS = (
+    "dQw4w9WgXcQ",      # Rick Roll
+    "hWIjko3ilns",      # User provided video
+    "Lf3qNlJaYQA",      # MKBHD recent video (should have transcript)
+)
+
+# One keep-alive session shared by every probe, so only the first request
+# to YouTube pays for the TCP + TLS handshake
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.5),
+))
+# Ask for compressed responses explicitly (only encodings urllib3 can decode
+# here); Google APIs also look for "gzip" in the User-Agent
+SESSION.headers.update({
+    "Accept-Encoding": ACCEPT_ENCODING,
+    "User-Agent": "Mozilla/5.0 (compatible; UmActually/1.0; gzip)",
+})
+
+# Transient failures worth retrying: throttling (the exception's name depends
+# on the youtube-transcript-api version) and dropped connections
+RETRYABLE_ERRORS = tuple(
+    getattr(youtube_transcript_api, name)
+    for name in ("TooManyRequests", "RequestBlocked")
+    if hasattr(youtube_transcript_api, name)
+) + (requests.ConnectionError,)
+RETRY_ATTEMPTS = 5
+RETRY_INITIAL_WAIT = 1.0
+RETRY_MAX_WAIT = 30.0
+
+def with_retry(fn, *args):
+    """
+    Call fn(*args), retrying RETRYABLE_ERRORS with jittered exponential
+    backoff (1s, 2s, 4s, ... capped at RETRY_MAX_WAIT, plus up to 1s jitter).
+    """
+    for attempt in range(RETRY_ATTEMPTS):
+        try:
+            return fn(*args)
+        except RETRYABLE_ERRORS:
+            if attempt == RETRY_ATTEMPTS - 1:
+                raise
+            wait = min(RETRY_MAX_WAIT, RETRY_INITIAL_WAIT * 2 ** attempt)
+            time.sleep(wait + random.uniform(0, 1))
+
+def list_transcripts(video_id):
+    """YouTubeTranscriptApi.list_transcripts, but over the shared SESSION"""
+    if hasattr(YouTubeTranscriptApi, "list"):
+        # youtube-transcript-api >= 1.0 takes the session as its HTTP client
+        return YouTubeTranscriptApi(http_client=SESSION).list(video_id)
+    # Older releases open a new session per call; use the fetcher directly
+    from youtube_transcript_api._transcripts import TranscriptListFetcher
+    return TranscriptListFetcher(SESSION).fetch(video_id)
+
+def load_probe_cache(path=PROBE_CACHE_PATH):
+    """Load cached probe results, dropping entries older than the TTL"""
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    now = time.time()
+    return {
+        video_id: entry for video_id, entry in cache.items()
+        if now - entry["checkedAt"] < PROBE_CACHE_TTL_SECONDS
+    }
+
+def save_probe_cache(cache, path=PROBE_CACHE_PATH):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, path)
+
+def test_video(video_id, count_segments=False):
+    """
+    Test if a video has transcripts available.
+    Returns (video_id, available, message) instead of printing, so concurrent
+    probes can be reported in a stable order. available is None when the
+    probe itself failed (e.g. a network error), so the result isn't cached.
+    The transcript listing already answers availability; with count_segments
+    the transcript itself is also downloaded to report its length.
+    """
     try:
-        transcripts = YouTubeTranscriptApi.list_transcripts(video_id)
+        transcripts = with_retry(list_transcripts, video_id)
 
         # Try English
         try:
             transcript = transcripts.find_transcript(['en', 'en-US'])
-            data = transcript.fetch()
-            print(f"✓ {video_id}: {len(data)} English segments")
-            return True
-        except:
+            if not count_segments:
+                return video_id, True, f"✓ {video_id}: English transcript available ({transcript.language_code})"
+            data = with_retry(transcript.fetch)
+            return video_id, True, f"✓ {video_id}: {len(data)} English segments"
+        except (NoTranscriptFound, TranscriptsDisabled):
             pass
 
-        # Try any language
+        # Try any language (TranscriptList yields manual transcripts first)
         try:
-            # Get first available
-            all_transcripts = []
-            if hasattr(transcripts, '_manually_created_transcripts'):
-                all_transcripts = transcripts._manually_created_transcripts
-            elif hasattr(transcripts, '_generated_transcripts'):
-                all_transcripts = transcripts._generated_transcripts
-
-            if all_transcripts:
-                data = all_transcripts[0].fetch()
-                lang = getattr(all_transcripts[0], 'language', 'Unknown')
-                print(f"✓ {video_id}: {len(data)} segments ({lang})")
-                return True
-        except:
+            for transcript in transcripts:
+                if not count_segments:
+                    return video_id, True, f"✓ {video_id}: Transcript available ({transcript.language_code})"
+                data = with_retry(transcript.fetch)
+                return video_id, True, f"✓ {video_id}: {len(data)} segments ({transcript.language_code})"
+        except (NoTranscriptFound, TranscriptsDisabled):
             pass
 
-        print(f"✗ {video_id}: No transcripts available")
-        return False
+        return video_id, False, f"✗ {video_id}: No transcripts available"
 
-    except Exception as e:
-        print(f"✗ {video_id}: Error - {type(e).__name__}")
-        return False
+    # Every youtube-transcript-api failure (video unavailable, throttled past
+    # the retries, ...) derives from CouldNotRetrieveTranscript
+    except (CouldNotRetrieveTranscript, requests.RequestException) as e:
+        return video_id, None, f"✗ {video_id}: Error - {type(e).__name__}"
+
+async def test_videos_async(video_ids, count_segments=False, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Probe all videos concurrently on a bounded thread pool (the transcript
+    API is blocking), yielding each result as soon as its probe finishes.
+    """
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(video_ids)))) as pool:
+        probes = [
+            loop.run_in_executor(pool, test_video, video_id, count_segments)
+            for video_id in video_ids
+        ]
+        for probe in asyncio.as_completed(probes):
+            yield await probe
+
+async def report_probes(video_ids, count_segments, concurrency):
+    """Print each probe's line as it lands; returns the (video_id, available, message) results"""
+    results = []
+    async for result in test_videos_async(video_ids, count_segments, concurrency):
+        sys.stdout.write(result[2] + "\n")
+        sys.stdout.flush()
+        results.append(result)
+    return results
+
+def print_results(
+    video_ids,
+    count_segments=False,
+    concurrency=DEFAULT_CONCURRENCY,
+    use_cache=True,
+    cache_path=PROBE_CACHE_PATH,
+):
+    """
+    Print one line per video. Videos checked within PROBE_CACHE_TTL_SECONDS
+    are answered from the cache (as long as the cached probe counted
+    segments, if count_segments asks for them) and printed first, in input
+    order; the rest are probed concurrently and printed as each one finishes.
+    With use_cache=False every video is probed and the cache file is left alone.
+    Repeated IDs are probed and reported once.
+    """
+    video_ids = list(dict.fromkeys(video_ids))
+    cache = load_probe_cache(cache_path) if use_cache else {}
+    to_probe = []
+    cached_lines = []
+    for video_id in video_ids:
+        if video_id not in cache or (count_segments and not cache[video_id].get("countedSegments")):
+            to_probe.append(video_id)
+        else:
+            cached_lines.append(cache[video_id]["message"])
+
+    # One write for all cached answers rather than a print() per video
+    if cached_lines:
+        sys.stdout.write("\n".join(cached_lines) + "\n")
+        sys.stdout.flush()
+
+    if to_probe:
+        now = time.time()
+        results = asyncio.run(report_probes(to_probe, count_segments, concurrency))
+        for video_id, available, message in results:
+            if available is not None:
+                cache[video_id] = {
+                    "checkedAt": now,
+                    "available": available,
+                    "message": message,
+                    "countedSegments": count_segments,
+                }
+        if use_cache:
+            save_probe_cache(cache, cache_path)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Check which YouTube videos have transcripts available"
+    )
+    parser.add_argument("video_ids", nargs="*", help="video IDs to check (default: a few examples)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"number of videos probed at once (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--no-cache", dest="use_cache", action="store_false",
+                        help="probe every video and don't read or write the cache")
+    parser.add_argument("--cache-path", default=PROBE_CACHE_PATH,
+                        help=f"probe cache file (default: {PROBE_CACHE_PATH})")
+    parser.add_argument("--count-segments", action="store_true",
+                        help="download each transcript to report its segment count")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
+    args = parse_args()
+    options = {
+        "count_segments": args.count_segments,
+        "concurrency": args.concurrency,
+        "use_cache": args.use_cache,
+        "cache_path": args.cache_path,
+    }
+
     print("YouTube Transcript Availability Checker")
     print("=" * 60)
 
     # Test with video IDs provided as arguments
-    if len(sys.argv) > 1:
-        for video_id in sys.argv[1:]:
-            test_video(video_id)
+    if args.video_ids:
+        print_results(args.video_ids, **options)
     else:
         # Test with some example videos
-        print("Usage: python3 test_videos.py <video_id1> <video_id2> ...")
+        print("Usage: python3 test_videos.py [options] <video_id1> <video_id2> ...")
         print("\nTesting some example videos:")
         print("=" * 60)
 
-        example_videos = [
-            "dQw4w9WgXcQ",      # Rick Roll
-            "hWIjko3ilns",      # User provided video
-            "Lf3qNlJaYQA",      # MKBHD recent video (should have transcript)
-        ]
-
-        for vid in example_videos:
-            test_video(vid)
+        print_results(EXAMPLE_VIDEOS, **options)
@@ -0,0 +1,94 @@
+from services.vtt_parser import (
+    VttStreamParser,
+    _dedup_rolling_cues,
+    _iter_vtt_cues,
+    iter_json3_segments,
+    iter_vtt_segments,
+)
+
+# YouTube auto-generated (ASR) captions: every cue repeats the previous line
+# before adding new words, with a 10 ms cue in between that repeats it alone
+# (the first cue's empty line holds a single space, as YouTube sends it)
+ASR_VTT = """WEBVTT
+Kind: captions
+Language: en
+
+00:00:00.000 --> 00:00:02.500 align:start position:0%
+\x20
+so<00:00:00.400><c> today</c><00:00:00.800><c> we're</c><00:00:01.200><c> talking</c>
+
+00:00:02.500 --> 00:00:02.510 align:start position:0%
+so today we're talking
+
+
+00:00:02.510 --> 00:00:05.000 align:start position:0%
+so today we're talking
+about<00:00:03.000><c> rolling</c><00:00:03.500><c> captions</c>
+
+00:00:05.000 --> 00:00:05.010 align:start position:0%
+about rolling captions
+
+
+00:00:05.010 --> 00:00:08.000 align:start position:0%
+about rolling captions
+and<00:00:06.000><c> why</c><00:00:07.000><c> they</c><00:00:07.500><c> repeat</c>
+
+00:00:08.000 --> 00:00:11.000 align:start position:0%
+and why they repeat
+so<00:00:09.000><c> much</c><00:00:10.000><c> &amp;</c><00:00:10.500><c> often</c>
+"""
+
+
+def test_rolling_cues_keep_only_new_words():
+    assert _dedup_rolling_cues(_iter_vtt_cues(ASR_VTT)) == [
+        (0.0, 2.5, "so today we're talking"),
+        (2.51, 5.0, "about rolling captions"),
+        (5.01, 8.0, "and why they repeat"),
+        (8.0, 11.0, "so much & often"),
+    ]
+
+
+def test_asr_segments_are_deduplicated():
+    segments = list(iter_vtt_segments(ASR_VTT, dedup=True))
+
+    assert [s["text"] for s in segments] == [
+        "so today we're talking about rolling captions",
+        "and why they repeat so much & often",
+    ]
+    assert [(s["startTime"], s["endTime"]) for s in segments] == [(0.0, 5.0), (5.01, 11.0)]
+    assert [s["id"] for s in segments] == ["seg_0", "seg_1"]
+
+
+def test_crlf_line_endings_parse_the_same():
+    crlf = ASR_VTT.replace("\n", "\r\n")
+
+    assert list(iter_vtt_segments(crlf, dedup=True)) == list(iter_vtt_segments(ASR_VTT, dedup=True))
+
+
+def _feed_in_chunks(vtt_content, size, dedup):
+    parser = VttStreamParser(dedup)
+    segments = []
+    for i in range(0, len(vtt_content), size):
+        segments.extend(parser.feed(vtt_content[i:i + size]))
+    segments.extend(parser.close())
+    return segments
+
+
+def test_stream_parser_matches_whole_document_parse():
+    for vtt_content in (ASR_VTT, ASR_VTT.replace("\n", "\r\n")):
+        for dedup in (False, True):
+            expected = list(iter_vtt_segments(vtt_content, dedup))
+            assert _feed_in_chunks(vtt_content, 7, dedup) == expected
+
+
+def test_json3_events_without_text_are_skipped():
+    raw = b"""{"events": [
+        {"tStartMs": 0, "dDurationMs": 11000, "id": 1, "wpWinPosId": 1},
+        {"tStartMs": 0, "dDurationMs": 2000, "segs": [{"utf8": "hello"}, {"utf8": " world"}]},
+        {"tStartMs": 2000, "dDurationMs": 10, "aAppend": 1, "segs": [{"utf8": "\\n"}]},
+        {"tStartMs": 2000, "dDurationMs": 4000, "segs": [{"utf8": "again"}]}
+    ]}"""
+
+    assert [(s["text"], s["startTime"], s["endTime"]) for s in iter_json3_segments(raw)] == [
+        ("hello world again", 0.0, 6.0),
+    ]